@@ -5,12 +5,15 @@ from serial import Serial
 from pyshimmer import ShimmerBluetooth, DEFAULT_BAUDRATE, DataPacket
 
 
-def stream_cb(pkt: DataPacket) -> None:   
-    print(f'Received new data packet: ') 
+def stream_cb(pkt: DataPacket) -> None:
+    # The callback is invoked for every packet, so we emit the whole packet with a single print call
+    lines = ['Received new data packet: ']
     for chan in pkt.channels:
-        print(f'channel: ' + str(chan)) 
-        print(f'value: ' + str(pkt[chan]))     
-    print('') 
+        lines.append(f'channel: {chan}')
+        lines.append(f'value: {pkt[chan]}')
+
+    print('\n'.join(lines) + '\n')
+
 
 def main(args=None):    
     serial = Serial('/dev/rfcomm42', DEFAULT_BAUDRATE)
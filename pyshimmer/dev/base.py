@@ -20,6 +20,10 @@ import numpy as np
 # Device clock rate in ticks per second
 DEV_CLOCK_RATE: float = 32768.0
 
+# The clock rate is a power of two, hence its reciprocal is exact and multiplying by it yields the same result as a
+# division
+_DEV_CLOCK_PERIOD: float = 1.0 / DEV_CLOCK_RATE
+
 DEFAULT_BAUDRATE = 115200
 
 
@@ -89,4 +93,4 @@ def ticks2sec(t_ticks: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
     Returns:
         A floating point time in seconds that is equivalent to the number of clock ticks
     """
-    return t_ticks / DEV_CLOCK_RATE
+    return t_ticks * _DEV_CLOCK_PERIOD
@@ -15,9 +15,11 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import struct
 from enum import Enum, auto, unique
-from typing import Dict, List, Iterable
+from typing import Dict, List, Iterable, Tuple
 
-from pyshimmer.util import raise_to_next_pow, unpack, flatten_list, bit_is_set
+import numpy as np
+
+from pyshimmer.util import raise_to_next_pow, unpack, flatten_list
 
 
 class ChannelDataType:
@@ -42,6 +44,10 @@ class ChannelDataType:
             8: 'Q',
         }
 
+        # The formats only depend on the properties of the data type, so we compile them once
+        self._struct = struct.Struct(self._get_struct_format())
+        self._array_dtype = self._get_array_dtype()
+
     @property
     def little_endian(self) -> bool:
         return self._le
@@ -99,17 +105,53 @@ class ChannelDataType:
 
         return prefix + stype
 
+    def _get_array_dtype(self) -> np.dtype:
+        # Values that need to be extended are decoded as unsigned values and sign-extended afterwards
+        byte_order = '<' if self.little_endian else '>'
+        kind = 'i' if self.signed and not self._needs_extend else 'u'
+        return np.dtype(f'{byte_order}{kind}{self._valid_size}')
+
     def decode(self, val_bin: bytes) -> any:
         if self._needs_extend:
             val_bin = self._extend_value(val_bin)
 
-        struct_format = self._get_struct_format()
-        r_tpl = struct.unpack(struct_format, val_bin)
+        r_tpl = self._struct.unpack(val_bin)
         return unpack(r_tpl)
 
+    def decode_array(self, val_bin: np.ndarray) -> np.ndarray:
+        """Decode a batch of binary values at once
+
+        :param val_bin: An array of type uint8 with shape (N, size) where each row holds a single binary value
+        :return: An array with shape (N, ) that contains the decoded values in native byte order
+        """
+        n_values = len(val_bin)
+
+        if self._needs_extend:
+            # Pad the values to the next valid size and sign-extend them after the conversion
+            val_padded = np.zeros((n_values, self._valid_size), dtype=np.uint8)
+            if self.little_endian:
+                val_padded[:, :self._size] = val_bin
+            else:
+                val_padded[:, self._valid_size - self._size:] = val_bin
+
+            val_bin = val_padded
+
+        dtype = self._array_dtype
+        values = np.ascontiguousarray(val_bin).view(dtype).reshape(n_values)
+        values = values.astype(dtype.newbyteorder('='))
+
+        if self._needs_extend and self.signed:
+            # Move the sign bit of the value to the MSB of the padded type and shift it back arithmetically, which
+            # sign-extends all values without branching on their sign
+            shift = 8 * (self._valid_size - self._size)
+            values = values.view(f'=i{self._valid_size}')
+            values <<= shift
+            values >>= shift
+
+        return values
+
     def encode(self, val: int) -> bytes:
-        struct_format = self._get_struct_format()
-        val_packed = struct.pack(struct_format, val)
+        val_packed = self._struct.pack(val)
 
         if self._needs_extend:
             return self._truncate_value(val_packed)
@@ -359,6 +401,9 @@ SensorOrder: Dict[ESensorGroup, int] = {
     ESensorGroup.EXG2_16BIT: 21,
 }
 
+# The bit of every sensor in the enabled sensors bitfield, in the enumeration order of the sensors
+_SENSOR_BITS: Tuple[Tuple[ESensorGroup, int], ...] = tuple((s, SensorBitAssignments[s]) for s in ESensorGroup)
+
 ENABLED_SENSORS_LEN = 0x03
 SENSOR_DTYPE = ChannelDataType(size=ENABLED_SENSORS_LEN, signed=False, le=True)
 
@@ -422,12 +467,8 @@ def bitfield2sensors(bitfield: int) -> List[ESensorGroup]:
     :param bitfield: The bitfield received from the Shimmer encoding the active sensors
     :return: The corresponding list of active sensors
     """
-    enabled_sensors = []
-    for sensor in ESensorGroup:
-        bit_pos = SensorBitAssignments[sensor]
-        if bit_is_set(bitfield, bit_pos):
-            enabled_sensors += [sensor]
-
+    # Every sensor occupies a single bit, so a non-zero intersection means that the bit is set
+    enabled_sensors = [sensor for sensor, bit_pos in _SENSOR_BITS if bitfield & bit_pos]
     return sort_sensors(enabled_sensors)
 
 
@@ -454,9 +495,4 @@ def sort_sensors(sensors: Iterable[ESensorGroup]) -> List[ESensorGroup]:
         A list with the same sensors as content but sorted according to their appearance order in the data file
 
     """
-
-    def sort_key_fn(x):
-        return SensorOrder[x]
-
-    sensors_sorted = sorted(sensors, key=sort_key_fn)
-    return sensors_sorted
+    return sorted(sensors, key=SensorOrder.__getitem__)
@@ -13,7 +13,6 @@
 
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
-import re
 from enum import Enum
 from typing import List, Dict, Tuple
 
@@ -57,11 +56,21 @@ class ExGRegister:
     PD_BIT = 0x01 << 7
     RLD_PD_BIT = 0x01 << 5
 
+    __slots__ = ('_reg_bin', '_ch_bytes', '_rld_byte', '_dr_bin', '_rld_ref_bin')
+
     def __init__(self, reg_bin: bytes):
         if len(reg_bin) < 10:
             raise ValueError('Binary register content must have length 10')
 
-        self._reg_bin = reg_bin
+        # Copy the contents such that the extracted fields cannot diverge from a mutable input buffer
+        self._reg_bin = reg_bin = bytes(reg_bin)
+
+        # Extract the raw register fields once. They are only mapped to their meaning upon access, since arbitrary
+        # register contents may contain values without a valid interpretation.
+        self._ch_bytes = (reg_bin[3], reg_bin[4])
+        self._rld_byte = reg_bin[5]
+        self._dr_bin = reg_bin[0] & 0x07
+        self._rld_ref_bin = (reg_bin[9] >> 1) & 0x01
 
     def __str__(self) -> str:
         def print_ch(ch_id: int) -> str:
@@ -94,11 +103,10 @@ class ExGRegister:
             raise ValueError('Channel ID must be 0 or 1')
 
     def _get_ch_byte(self, ch_id: int) -> int:
-        ch_offset = 3 + ch_id
-        return self._reg_bin[ch_offset]
+        return self._ch_bytes[ch_id]
 
     def _get_rld_byte(self) -> int:
-        return self._reg_bin[0x05]
+        return self._rld_byte
 
     def get_ch_gain(self, ch_id: int) -> int:
         self.check_ch_id(ch_id)
@@ -153,8 +161,7 @@ class ExGRegister:
 
     @property
     def data_rate(self) -> int:
-        dr_bin = self._reg_bin[0] & 0x07
-        return self.DATA_RATE_MAP[dr_bin]
+        return self.DATA_RATE_MAP[self._dr_bin]
 
     @property
     def rld_powerdown(self) -> bool:
@@ -168,9 +175,7 @@ class ExGRegister:
 
     @property
     def rld_ref(self) -> ERLDRef:
-        ref_byte = self._reg_bin[9]
-        rld_ref = (ref_byte >> 1) & 0x01
-        return ERLDRef(rld_ref)
+        return ERLDRef(self._rld_ref_bin)
 
 
 ExG_ChType_Chip_Assignment: Dict[EChannelType, Tuple[int, int]] = {
@@ -198,9 +203,7 @@ def is_exg_ch(ch_type: EChannelType) -> bool:
     Returns:
         True if the channel type belongs to the ExG chips, otherwise False
     """
-    # This is hacky but protected by unit tests
-    regex = re.compile(r'EXG_ADS1292R_\d_CH\d_\d{2}BIT')
-    return regex.match(ch_type.name) is not None
+    return ch_type in ExG_ChType_Chip_Assignment
 
 
 def get_exg_ch(ch_type: EChannelType) -> Tuple[int, int]:
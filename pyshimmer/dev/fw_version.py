@@ -33,6 +33,7 @@ class EFirmwareType(Enum):
 
 
 class FirmwareVersion:
+    __slots__ = ('major', 'minor', 'rel', '_key')
 
     def __init__(self, major: int, minor: int, rel: int):
         """Represents the version of the Shimmer firmware
@@ -46,8 +47,10 @@ class FirmwareVersion:
         self.rel = rel
         self._key = (major, minor, rel)
 
-    @ensure_firmware_version
     def __eq__(self, other: "FirmwareVersion") -> bool:
+        if not isinstance(other, FirmwareVersion):
+            return NotImplemented
+
         return self._key == other._key
 
     @ensure_firmware_version
@@ -67,12 +70,18 @@ class FirmwareVersion:
         return self._key <= other._key
 
 
+# First LogAndStream version that allows disabling the acknowledgement of instream commands
+ACK_DISABLE_MIN_VERSION = FirmwareVersion(major=0, minor=15, rel=4)
+
+
 class FirmwareCapabilities:
 
     def __init__(self, fw_type: EFirmwareType, version: FirmwareVersion):
         self._fw_type = fw_type
         self._version = version
 
+        self._supports_ack_disable = fw_type == EFirmwareType.LogAndStream and version >= ACK_DISABLE_MIN_VERSION
+
     @property
     def fw_type(self) -> EFirmwareType:
         return self._fw_type
@@ -83,8 +92,7 @@ class FirmwareCapabilities:
 
     @property
     def supports_ack_disable(self) -> bool:
-        return self._fw_type == EFirmwareType.LogAndStream and \
-               self._version >= FirmwareVersion(major=0, minor=15, rel=4)
+        return self._supports_ack_disable
 
 
 FirmwareTypeValueAssignment = {
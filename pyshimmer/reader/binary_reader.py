@@ -14,7 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import struct
-from typing import List, Tuple, Union, BinaryIO
+from typing import List, Tuple, BinaryIO
 
 import numpy as np
 
@@ -25,7 +25,7 @@ from pyshimmer.util import FileIOBase, unpack, bit_is_set
 from .reader_const import RTC_CLOCK_DIFF_OFFSET, ENABLED_SENSORS_OFFSET, SR_OFFSET, \
     START_TS_OFFSET, START_TS_LEN, TRIAL_CONFIG_OFFSET, TRIAL_CONFIG_MASTER, TRIAL_CONFIG_SYNC, BLOCK_LEN, \
     DATA_LOG_OFFSET, EXG_REG_OFFSET, EXG_REG_LEN, TRIAXCAL_FILE_OFFSET, TRIAXCAL_OFFSET_SCALING, \
-    TRIAXCAL_GAIN_SCALING, TRIAXCAL_ALIGNMENT_SCALING
+    TRIAXCAL_GAIN_SCALING, TRIAXCAL_ALIGNMENT_SCALING, SYNC_OFFSET_LEN, SYNC_OFFSET_INVALID
 
 
 class ShimmerBinaryReader(FileIOBase):
@@ -53,6 +53,8 @@ class ShimmerBinaryReader(FileIOBase):
         self._sensors = self._read_enabled_sensors()
         self._channels = self.get_data_channels(self._sensors)
         self._channel_dtypes = get_ch_dtypes(self._channels)
+        self._channel_offsets = np.cumsum([0] + [d.size for d in self._channel_dtypes[:-1]])
+        self._sample_size = sum([d.size for d in self._channel_dtypes])
         self._rtc_diff = self._read_rtc_clock_diff()
         self._start_ts = self._read_start_time()
         self._trial_config = self._read_trial_config()
@@ -93,88 +95,63 @@ class ShimmerBinaryReader(FileIOBase):
         return self._read_packed('<H')
 
     def _calculate_block_size(self):
-        sync_stamp = 9 * self.has_sync
-        sample_size = sum([d.size for d in self._channel_dtypes])
+        sync_stamp = SYNC_OFFSET_LEN * self.has_sync
 
-        num_samples = int((BLOCK_LEN - sync_stamp) / sample_size)
-        block_len = num_samples * sample_size + sync_stamp
+        num_samples = int((BLOCK_LEN - sync_stamp) / self._sample_size)
+        block_len = num_samples * self._sample_size + sync_stamp
 
         return num_samples, block_len
 
-    def _read_sync_offset(self) -> Union[None, int]:
-        # For this read operation we assume that every synchronization offset is immediately followed by a
-        # timestamp as it is described in the manuals. We need to pair every sync offset with a timestamp for
-        # interpolation at a later point in time.
-        offset_sign_bool = self._read_packed('B')
-        offset_sign = 1 - 2 * offset_sign_bool
-        offset_mag = self._read_packed('<Q')
-
-        if offset_mag == 2 ** 64 - 1:
-            return None
-
-        offset = offset_sign * offset_mag
-
-        return offset
-
-    def _read_sample(self) -> List:
-        ch_values = []
-
-        for ch, dtype in zip(self._channels, self._channel_dtypes):
-            val_bin = self._read(dtype.size)
-            ch_values.append(dtype.decode(val_bin))
-
-        return ch_values
-
-    def _read_data_block(self) -> Tuple[List[List], int]:
-        sync_tuple = None
-        samples = []
-
-        try:
-            if self.has_sync:
-                sync_tuple = self._read_sync_offset()
-
-            for i in range(self._samples_per_block):
-                sample = self._read_sample()
-                samples += [sample]
-        except IOError:
-            pass
-
-        return samples, sync_tuple
-
-    def _read_contents(self) -> Tuple[List, List[Tuple[int, int]]]:
-        sync_offsets = []
-        samples = []
-        sample_ctr = 0
-
+    def _read_contents(self) -> Tuple[np.ndarray, np.ndarray]:
         self._seek(DATA_LOG_OFFSET)
-        while True:
-            block_samples, sync_offset = self._read_data_block()
-
-            if sync_offset is not None:
-                sync_offsets += [(sample_ctr, sync_offset)]
-
-            samples += block_samples
-            sample_ctr += len(block_samples)
-
-            if len(block_samples) < self.samples_per_block:
-                # We have reached EOF
-                break
-
-        return samples, sync_offsets
-
-    def _read_exg_regs(self) -> Tuple[bytes, bytes]:
+        data = np.frombuffer(self._read_remaining(), dtype=np.uint8)
+
+        sync_len = SYNC_OFFSET_LEN * self.has_sync
+        sample_size = self._sample_size
+
+        # The data section consists of consecutive blocks, which each start with an optional synchronization offset
+        # that is followed by the samples. Only the last block can be incomplete.
+        n_blocks = len(data) // self._block_size
+        blocks = data[:n_blocks * self._block_size].reshape(n_blocks, self._block_size)
+        sync_bin = blocks[:, :sync_len]
+        samples_bin = blocks[:, sync_len:].reshape(-1, sample_size)
+
+        # If the file ends within the synchronization offset of the last block, the block does not contain any samples.
+        tail = data[n_blocks * self._block_size:]
+        if len(tail) > 0 and len(tail) >= sync_len:
+            if sync_len > 0:
+                sync_bin = np.concatenate((sync_bin, tail[None, :sync_len]))
+
+            tail = tail[sync_len:]
+            n_tail_samples = len(tail) // sample_size
+            tail_bin = tail[:n_tail_samples * sample_size].reshape(n_tail_samples, sample_size)
+            samples_bin = np.concatenate((samples_bin, tail_bin))
+
+        return samples_bin, sync_bin
+
+    def _decode_sync_offsets(self, sync_bin: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Every synchronization offset consists of a sign byte followed by its magnitude as 64bit integer. For
+        # interpolation at a later point in time, we pair every offset with the index of the first sample of its block.
+        offset_sign = 1 - 2 * sync_bin[:, 0].astype(np.int64)
+        offset_mag = np.ascontiguousarray(sync_bin[:, 1:]).view('<u8').reshape(len(sync_bin))
+        offset_index = np.arange(len(sync_bin)) * self._samples_per_block
+
+        valid = offset_mag != SYNC_OFFSET_INVALID
+        offsets = offset_sign[valid] * offset_mag[valid].astype(np.int64)
+        return offset_index[valid], offsets
+
+    def _read_exg_regs(self) -> Tuple[ExGRegister, ExGRegister]:
         self._seek(EXG_REG_OFFSET)
 
         reg1 = self._read(EXG_REG_LEN)
         reg2 = self._read(EXG_REG_LEN)
-        return reg1, reg2
+        return ExGRegister(reg1), ExGRegister(reg2)
 
     def _read_triaxcal_params(self, offset: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         fmt = ">" + 6 * 'h' + 9 * 'b'
 
         self._seek(offset)
-        calib_param_bytes = self._read(struct.calcsize(fmt))
-        params_raw = struct.unpack(fmt, calib_param_bytes)
+        params_raw = self._read_packed(fmt)
 
         offset = np.array(params_raw[:3])
         gain = np.diag(params_raw[3:6])
@@ -183,25 +160,23 @@ class ShimmerBinaryReader(FileIOBase):
         return offset, gain, alignment
 
     def read_data(self):
-        samples, sync_offsets = self._read_contents()
+        samples_bin, sync_bin = self._read_contents()
 
-        samples_per_ch = list(zip(*samples))
-        arr_per_ch = [np.array(s) for s in samples_per_ch]
-        samples_dict = dict(zip(self._channels, arr_per_ch))
+        samples_dict = {}
+        for ch, dtype, offset in zip(self._channels, self._channel_dtypes, self._channel_offsets):
+            ch_bin = samples_bin[:, offset:offset + dtype.size]
+            samples_dict[ch] = dtype.decode_array(ch_bin).astype(np.int64)
 
-        if self.has_sync and len(sync_offsets) > 0:
-            off_index, offset = list(zip(*sync_offsets))
-            off_index_arr = np.array(off_index)
-            offset_arr = np.array(offset)
-            sync_data = (off_index_arr, offset_arr)
-        else:
-            sync_data = ((), ())
+        sync_data = ((), ())
+        if self.has_sync:
+            off_index, offsets = self._decode_sync_offsets(sync_bin)
+            if len(offsets) > 0:
+                sync_data = (off_index, offsets)
 
         return samples_dict, sync_data
 
     def get_exg_reg(self, chip_id: int) -> ExGRegister:
-        reg_content = self._exg_regs[chip_id]
-        return ExGRegister(reg_content)
+        return self._exg_regs[chip_id]
 
     def get_triaxcal_params(self, sensor: ESensorGroup) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         offset = TRIAXCAL_FILE_OFFSET[sensor]
@@ -30,6 +30,11 @@ TRIAL_CONFIG_OFFSET = 0x10
 DATA_LOG_OFFSET = 0x100
 BLOCK_LEN = 0x200
 
+# Each block of a synchronized recording starts with a one byte sign and the eight byte magnitude of the offset
+SYNC_OFFSET_LEN = 0x09
+# Magnitude of a synchronization offset which signals that no offset is available for the block
+SYNC_OFFSET_INVALID = 2 ** 64 - 1
+
 TRIAL_CONFIG_SYNC = 0x04 << 8 * 0
 TRIAL_CONFIG_MASTER = 0x02 << 8 * 0
 
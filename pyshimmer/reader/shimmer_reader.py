@@ -32,9 +32,27 @@ def unwrap_device_timestamps(ts_dev: np.ndarray) -> np.ndarray:
 
 
 def fit_linear_1d(xp, fp, x):
-    fit_coef = np.polyfit(xp, fp, 1)
-    fn = np.poly1d(fit_coef)
-    return fn(x)
+    # Closed-form least squares fit of a straight line, which avoids the generic polynomial fitting machinery
+    xp = np.asarray(xp, dtype=np.float64)
+    fp = np.asarray(fp, dtype=np.float64)
+
+    xp_mean = xp.mean()
+    fp_mean = fp.mean()
+    xp_centered = xp - xp_mean
+
+    # A single point or points that share the same x value do not determine a slope. In this case, the fit
+    # degenerates to a constant.
+    xp_var = np.dot(xp_centered, xp_centered)
+    if xp_var > 0:
+        slope = np.dot(xp_centered, fp - fp_mean) / xp_var
+    else:
+        slope = 0.0
+    intercept = fp_mean - slope * xp_mean
+
+    # Add the intercept in place to avoid a second temporary of the size of x
+    y = np.multiply(x, slope)
+    y += intercept
+    return y
 
 
 class ChannelPostProcessor(ABC):
@@ -49,15 +67,15 @@ class SingleChannelProcessor(ChannelPostProcessor, ABC):
 
     def __init__(self, ch_types: List[EChannelType] = None):
         super().__init__()
-        self._ch_types = ch_types
+        self._ch_types = frozenset(ch_types) if ch_types is not None else None
 
     def process(self, channels: Dict[EChannelType, np.ndarray], reader: ShimmerBinaryReader) -> \
             Dict[EChannelType, np.ndarray]:
 
         if self._ch_types is None:
-            ch_types = list(channels.keys())
+            ch_types = channels.keys()
         else:
-            ch_types = [t for t in self._ch_types if t in channels]
+            ch_types = channels.keys() & self._ch_types
 
         result = channels.copy()
         for ch_type in ch_types:
@@ -94,10 +112,11 @@ class PPGProcessor(SingleChannelProcessor):
 
     def __init__(self):
         super().__init__([EChannelType.INTERNAL_ADC_13])
+        self._mv_to_v = 1.0 / 1000.0
 
     def process_channel(self, ch_type: EChannelType, y: np.ndarray, reader: ShimmerBinaryReader) -> np.ndarray:
-        # Convert from mV to V
-        return y / 1000.0
+        # Convert from mV to V, multiplying by the reciprocal is cheaper than a division
+        return y * self._mv_to_v
 
 
 class TriAxCalProcessor(ChannelPostProcessor):
@@ -107,16 +126,23 @@ class TriAxCalProcessor(ChannelPostProcessor):
         result = channels.copy()
 
         active_sensors = [s for s in reader.enabled_sensors if s in TRIAXCAL_SENSORS]
-        for sensor in active_sensors:
-            sensor_channels = get_enabled_channels([sensor])
-            channel_data = np.stack([channels[c] for c in sensor_channels])
-            o, g, a = reader.get_triaxcal_params(sensor)
+        if len(active_sensors) == 0:
+            return result
+
+        sensor_channels = [get_enabled_channels([s]) for s in active_sensors]
+        o, g, a = zip(*[reader.get_triaxcal_params(s) for s in active_sensors])
+
+        # All sensor groups are calibrated with a single batched solve on a fresh (G, 3, N) array, from which the
+        # offsets can be removed in place
+        channel_data = np.array([[channels[c] for c in chs] for chs in sensor_channels], dtype=np.float64)
+        channel_data -= np.array(o)[..., None]
 
-            g_a = np.matmul(g, a)
-            r = np.linalg.solve(g_a, channel_data - o[..., None])
+        g_a = np.matmul(g, a)
+        r = np.linalg.solve(g_a, channel_data)
 
-            for i, ch in enumerate(sensor_channels):
-                result[ch] = r[i]
+        for r_sensor, chs in zip(r, sensor_channels):
+            for i, ch in enumerate(chs):
+                result[ch] = r_sensor[i]
 
         return result
 
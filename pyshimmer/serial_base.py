@@ -13,13 +13,12 @@
 
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
-import struct
 from io import RawIOBase
 from typing import Callable
 
 from serial import Serial
 
-from pyshimmer.util import unpack
+from pyshimmer.util import unpack, get_struct
 
 
 class ReadAbort(Exception):
@@ -59,8 +58,12 @@ class BufferedReader:
         return bytes(self._buf[:n])
 
     def _take_from_buf(self, n: int) -> bytes:
+        # Without any peeked data, the bytes can be handed out directly without a detour through the buffer
+        if len(self._buf) == 0:
+            return self._do_read_or_throw(n)
+
         data = self._get_from_buf(n)
-        self._buf = self._buf[n:]
+        del self._buf[:n]
         return data
 
     def read(self, n: int) -> bytes:
@@ -90,7 +93,7 @@ class BufferedReader:
         """Clear the internal buffer of the reader
 
         """
-        self._buf = bytearray()
+        self._buf.clear()
 
 
 class SerialBase:
@@ -108,10 +111,10 @@ class SerialBase:
 
     @staticmethod
     def _retrieve_packed(fn_read: Callable[[int], bytes], rformat: str) -> any:
-        read_len = struct.calcsize(rformat)
+        rstruct = get_struct(rformat)
 
-        r = fn_read(read_len)
-        args_unpacked = struct.unpack(rformat, r)
+        r = fn_read(rstruct.size)
+        args_unpacked = rstruct.unpack(r)
         return unpack(args_unpacked)
 
     def flush_input_buffer(self):
@@ -146,7 +149,7 @@ class SerialBase:
         :param args: The arguments for the format string
         :return: The number of bytes written to the stream
         """
-        args_packed = struct.pack(wformat, *args)
+        args_packed = get_struct(wformat).pack(*args)
         return self.write(args_packed)
 
     def read(self, read_len: int) -> bytes:
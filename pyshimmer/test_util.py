@@ -72,9 +72,7 @@ class MockSerial(RawIOBase):
         self._read_buf = BytesIO()
 
     def test_get_write_data(self) -> bytes:
-        self._write_buf.seek(0, SEEK_SET)
-        data = self._write_buf.read()
-
+        data = self._write_buf.getvalue()
         self._write_buf = BytesIO()
         return data
 
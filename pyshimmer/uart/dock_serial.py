@@ -14,20 +14,23 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import binascii
-import struct
 
 from serial import Serial
 
 from pyshimmer.serial_base import SerialBase
 from pyshimmer.uart.dock_const import CRC_INIT
+from pyshimmer.util import get_struct
 
 
 def generate_crc(msg: bytes, crc_init: int) -> bytes:
+    crc = binascii.crc_hqx(msg, crc_init)
+
+    # Messages of uneven length are padded with a zero byte. We feed the padding to the running CRC instead of
+    # appending it to the message, which would copy the message and modify the write buffer of the caller.
     if len(msg) % 2 != 0:
-        msg += b'\x00'
+        crc = binascii.crc_hqx(b'\x00', crc)
 
-    crc = binascii.crc_hqx(msg, crc_init)
-    crc_bin = struct.pack('<H', crc)
+    crc_bin = get_struct('<H').pack(crc)
     return crc_bin
 
 
@@ -14,7 +14,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import struct
+from functools import lru_cache
 from io import SEEK_SET, SEEK_CUR
+from itertools import chain
 from queue import Queue
 from typing import BinaryIO, Tuple, Union, List
 
@@ -59,8 +61,7 @@ def flatten_list(lst: Union[List, Tuple]) -> List:
     :param lst: A list of lists
     :return: A list with the contents of the sublists
     """
-    lst_flat = [val for sublist in lst for val in sublist]
-    return lst_flat
+    return list(chain.from_iterable(lst))
 
 
 def fmt_hex(val: bytes) -> str:
@@ -69,7 +70,9 @@ def fmt_hex(val: bytes) -> str:
     :param val: The binary array to format
     :return: The resulting string
     """
-    return ' '.join('{:02x}'.format(i) for i in val)
+    # bytes.hex only supports a separator from Python 3.8 on, so we split the hex string into pairs ourselves
+    val_hex = val.hex()
+    return ' '.join(val_hex[i:i + 2] for i in range(0, len(val_hex), 2))
 
 
 def unpack(args: Union[List, Tuple]) -> Union[List, Tuple, any]:
@@ -86,6 +89,18 @@ def unpack(args: Union[List, Tuple]) -> Union[List, Tuple, any]:
     return args
 
 
+@lru_cache(maxsize=128)
+def get_struct(fmt: str) -> struct.Struct:
+    """Return a compiled :class:`struct.Struct` for the format string
+
+    The compiled objects are cached, such that the format string is only parsed once no matter how often it is used.
+
+    :param fmt: The format string, see :mod:`struct`
+    :return: The Struct object for the format
+    """
+    return struct.Struct(fmt)
+
+
 def unwrap(x: np.ndarray, shift: int) -> np.ndarray:
     """Detect overflows in the data and unwrap them
 
@@ -94,17 +109,26 @@ def unwrap(x: np.ndarray, shift: int) -> np.ndarray:
     series x_i > x_i+1. For every such point, the function will add the value of the shift parameter to all following
     samples, i.e. x_k' = x_k + shift, for every k > i.
 
+    The input array is left unchanged. Integer inputs narrower than 64bit are unwrapped into an int64 array such that
+    the unwrapped values cannot overflow, all other inputs retain their data type.
+
     :param x: The array to unwrap
     :param shift: The value which to add to the series after each overflow point
-    :return: An array of equal length that has been unwrapped
+    :return: A new array of equal length that has been unwrapped
     """
-    x_diff = np.diff(x)
-    wrap_points = np.argwhere(x_diff < 0)
+    x = np.asarray(x)
+    if x.dtype.kind in 'iu' and x.dtype.itemsize < 8:
+        result = x.astype(np.int64)
+    else:
+        result = x.copy()
 
-    for i in wrap_points.flatten():
-        x += (np.arange(len(x)) > i) * shift
+    # The number of overflows that precede each sample is the cumulative sum over all overflow points. We accumulate
+    # in the data type of the result, since the default integer type is only 32bit wide on some platforms and the
+    # product with the shift would overflow.
+    n_wraps = np.cumsum(x[1:] < x[:-1], dtype=result.dtype)
+    result[1:] += n_wraps * shift
 
-    return x
+    return result
 
 
 def resp_code_to_bytes(code: Union[int, Tuple[int, ...], bytes]) -> bytes:
@@ -133,24 +157,27 @@ def calibrate_u12_adc_value(uncalibratedData, offset, vRefP, gain):
     return ((uncalibratedData - offset) * ((vRefP/gain)/4095))
 
 
-def battery_voltage_to_percent(battery_voltage):
-    """Convert battery voltage to percent
+# Reference values from: https://shimmersensing.com/wp-content/docs/support/documentation/Shimmer_User_Manual_rev3p.pdf
+# (Page 53)
+_BATTERY_REF_VOLTAGES = np.array([
+    3.2, 3.627, 3.645, 3.663, 3.681, 3.699, 3.717, 3.7314, 3.735, 3.7386, 3.7566, 3.771, 3.789, 3.8034, 3.8106, 3.8394,
+    3.861, 3.8826, 3.9078, 3.933, 3.969, 4.0086, 4.041, 4.0734, 4.113, 4.167,
+])
+_BATTERY_REF_PERCENTAGES = np.array([
+    0, 5.9, 9.8, 13.8, 17.7, 21.6, 25.6, 29.5, 33.4, 37.4, 41.3, 45.2, 49.2, 53.1, 57, 61, 64.9, 68.9, 72.8, 76.7, 80.7,
+    84.6, 88.5, 92.5, 96.4, 100,
+])
 
-    :param battery_voltage: Battery voltage in Volt
-    :return: approximated battery state in percent based on manual 
-    """
-    # reference values from: https://shimmersensing.com/wp-content/docs/support/documentation/Shimmer_User_Manual_rev3p.pdf (Page 53)
-    reference_data_voltages = [3.2, 3.627, 3.645, 3.663, 3.681, 3.699, 3.717, 3.7314, 3.735, 3.7386, 3.7566, 3.771, 3.789, 3.8034, 3.8106, 3.8394, 3.861, \
-        3.8826, 3.9078, 3.933, 3.969, 4.0086, 4.041, 4.0734, 4.113, 4.167]
-    reference_data_percentages = [0, 5.9, 9.8, 13.8, 17.7, 21.6, 25.6, 29.5, 33.4, 37.4, 41.3, 45.2, 49.2, 53.1, 57, 61, 64.9, 68.9, 72.8, 76.7, 80.7, 84.6, \
-        88.5, 92.5, 96.4, 100]
 
-    battery_percent = np.interp(battery_voltage, reference_data_voltages, reference_data_percentages)
+def battery_voltage_to_percent(battery_voltage):
+    """Convert battery voltage to percent
 
-    battery_percent = min(battery_percent, 100)
-    battery_percent = max(battery_percent, 0)
+    Voltages outside of the reference range are clamped to 0 and 100 percent, respectively.
 
-    return battery_percent
+    :param battery_voltage: Battery voltage in Volt, can also be an array of voltages
+    :return: approximated battery state in percent based on manual
+    """
+    return np.interp(battery_voltage, _BATTERY_REF_VOLTAGES, _BATTERY_REF_PERCENTAGES)
 
 
 class PeekQueue(Queue):
@@ -197,6 +224,9 @@ class FileIOBase:
 
         return r
 
+    def _read_remaining(self) -> bytes:
+        return self._fp.read()
+
     def _seek(self, off: int = 0) -> None:
         self._fp.seek(off, SEEK_SET)
 
@@ -204,8 +234,8 @@ class FileIOBase:
         self._fp.seek(off, SEEK_CUR)
 
     def _read_packed(self, fmt: str) -> any:
-        s = struct.calcsize(fmt)
-        val_bin = self._read(s)
+        fmt_struct = get_struct(fmt)
+        val_bin = self._read(fmt_struct.size)
 
-        args = struct.unpack(fmt, val_bin)
+        args = fmt_struct.unpack(val_bin)
         return unpack(args)
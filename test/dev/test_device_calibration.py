@@ -19,9 +19,8 @@ from unittest import TestCase
 from pyshimmer.dev.calibration import AllCalibration
 
 def randbytes(k: int) -> bytes:
-    population = list(range(256))
-    seq = random.choices(population, k=k)
-    return bytes(seq)
+    # Equivalent to random.randbytes(), which is only available from Python 3.9 onwards
+    return random.getrandbits(8 * k).to_bytes(k, 'little')
 
 class AllCalibrationTest(TestCase):
 
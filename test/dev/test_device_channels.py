@@ -15,9 +15,49 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from unittest import TestCase
 
+import numpy as np
+
 from pyshimmer.dev.channels import ChDataTypeAssignment, get_ch_dtypes, SensorChannelAssignment, SensorBitAssignments, \
     ChannelDataType, EChannelType, ESensorGroup, sort_sensors
 
+# Little endian encoded values and their expected decodation, grouped by data type size and signedness
+_DECODE_CASES = [
+    (3, False, [
+        (b'\x00\x00\x00', 0x000000),
+        (b'\x10\x00\x00', 0x000010),
+        (b'\x00\x00\xFF', 0xFF0000),
+        (b'\xFF\xFF\xFF', 0xFFFFFF),
+    ]),
+    (3, True, [
+        (b'\xFF\xFF\xFF', -1),
+        (b'\x00\x00\x80', -2 ** 23),
+        (b'\xFF\xFF\x7F', 2 ** 23 - 1),
+        (b'\xFF\x00\x00', 255),
+    ]),
+    (2, False, [
+        (b'\x00\x00', 0x0000),
+        (b'\x10\x00', 0x0010),
+        (b'\x00\xFF', 0xFF00),
+        (b'\xFF\xFF', 0xFFFF),
+    ]),
+    (2, True, [
+        (b'\xFF\xFF', -1),
+        (b'\x00\x80', -2 ** 15),
+        (b'\xFF\x7F', 2 ** 15 - 1),
+        (b'\xFF\x00', 255),
+    ]),
+    (1, False, [
+        (b'\x00', 0x00),
+        (b'\x80', 0x80),
+        (b'\xFF', 0xFF),
+    ]),
+    (1, True, [
+        (b'\x80', -2 ** 7),
+        (b'\x7F', 2 ** 7 - 1),
+        (b'\xFF', -1),
+    ]),
+]
+
 
 class DeviceChannelsTest(TestCase):
 
@@ -29,14 +69,6 @@ class DeviceChannelsTest(TestCase):
             self.fail(f'Enum not unique: {e}')
 
     def test_channel_data_type_decoding(self):
-        def test_both_endianess(byte_val_le: bytes, expected: int, signed: bool):
-            blen = len(byte_val_le)
-            dt_le = ChannelDataType(blen, signed=signed, le=True)
-            dt_be = ChannelDataType(blen, signed=signed, le=False)
-
-            self.assertEqual(expected, dt_le.decode(byte_val_le))
-            self.assertEqual(expected, dt_be.decode(byte_val_le[::-1]))
-
         # Test the property getters
         dt = ChannelDataType(3, signed=False, le=True)
         self.assertEqual(dt.little_endian, True)
@@ -49,29 +81,25 @@ class DeviceChannelsTest(TestCase):
         self.assertEqual(dt.little_endian, False)
         self.assertEqual(dt.big_endian, True)
 
-        # Test unsigned decodation for 3 byte data
-        test_both_endianess(b'\x00\x00\x00', 0x000000, signed=False)
-        test_both_endianess(b'\x10\x00\x00', 0x000010, signed=False)
-        test_both_endianess(b'\x00\x00\xFF', 0xFF0000, signed=False)
-        test_both_endianess(b'\xFF\xFF\xFF', 0xFFFFFF, signed=False)
-
-        # Test signed decodation for 3 byte data
-        test_both_endianess(b'\xFF\xFF\xFF', -1, signed=True)
-        test_both_endianess(b'\x00\x00\x80', -2 ** 23, signed=True)
-        test_both_endianess(b'\xFF\xFF\x7F', 2 ** 23 - 1, signed=True)
-        test_both_endianess(b'\xFF\x00\x00', 255, signed=True)
-
-        # Test unsigned decodation for 2 byte data
-        test_both_endianess(b'\x00\x00', 0x0000, signed=False)
-        test_both_endianess(b'\x10\x00', 0x0010, signed=False)
-        test_both_endianess(b'\x00\xFF', 0xFF00, signed=False)
-        test_both_endianess(b'\xFF\xFF', 0xFFFF, signed=False)
-
-        # Test signed decodation for 2 byte data
-        test_both_endianess(b'\xFF\xFF', -1, signed=True)
-        test_both_endianess(b'\x00\x80', -2 ** 15, signed=True)
-        test_both_endianess(b'\xFF\x7F', 2 ** 15 - 1, signed=True)
-        test_both_endianess(b'\xFF\x00', 255, signed=True)
+        for size, signed, cases in _DECODE_CASES:
+            dt_le = ChannelDataType(size, signed=signed, le=True)
+            dt_be = ChannelDataType(size, signed=signed, le=False)
+
+            for byte_val_le, expected in cases:
+                self.assertEqual(expected, dt_le.decode(byte_val_le))
+                self.assertEqual(expected, dt_be.decode(byte_val_le[::-1]))
+
+    def test_channel_data_type_array_decoding(self):
+        for size, signed, cases in _DECODE_CASES:
+            dt_le = ChannelDataType(size, signed=signed, le=True)
+            dt_be = ChannelDataType(size, signed=signed, le=False)
+
+            # Decode all values of a table in one batch, with one value per row
+            vals_le = np.frombuffer(b''.join(b for b, _ in cases), dtype=np.uint8).reshape(-1, size)
+            expected = [e for _, e in cases]
+
+            np.testing.assert_equal(dt_le.decode_array(vals_le), expected)
+            np.testing.assert_equal(dt_be.decode_array(vals_le[:, ::-1]), expected)
 
     def test_channel_data_type_encoding(self):
         def test_both_endianess(val: int, val_len: int, expected: bytes, signed: bool):
@@ -21,9 +21,8 @@ from pyshimmer.dev.exg import is_exg_ch, get_exg_ch, ExGMux, ExGRLDLead, ERLDRef
 
 
 def randbytes(k: int) -> bytes:
-    population = list(range(256))
-    seq = random.choices(population, k=k)
-    return bytes(seq)
+    # Equivalent to random.randbytes(), which is only available from Python 3.9 onwards
+    return random.getrandbits(8 * k).to_bytes(k, 'little')
 
 
 class DeviceExGTest(TestCase):
@@ -80,6 +79,16 @@ class ExGRegisterTest(TestCase):
         self.assertRaises(ValueError, exg_reg1.get_ch_mux, 2)
         self.assertRaises(ValueError, exg_reg1.get_ch_mux, -1)
 
+    def test_exg_register_mutable_input(self):
+        reg_bin = bytearray([3, 160, 16, 64, 71, 0, 0, 0, 2, 1])
+        reg = ExGRegister(reg_bin)
+
+        # Changes to the input buffer must not affect the register
+        reg_bin[3] = 0
+        self.assertEqual(reg.ch1_gain, 4)
+        self.assertEqual(reg.binary, bytes([3, 160, 16, 64, 71, 0, 0, 0, 2, 1]))
+        self.assertNotEqual(reg, ExGRegister(reg_bin))
+
     def test_exg_register_powerdown(self):
         pd = 0x1 << 7
         reg_bin = bytes([3, 160, 16, pd, pd, 0, 0, 0, 2, 1])
@@ -133,6 +142,7 @@ class ExGRegisterTest(TestCase):
         do_assert(y, y, True)
 
         for i in range(len(x)):
+            # Inverting the byte guarantees that it differs from the original one
             y = bytearray(x)
-            y[i] = random.randrange(0, 256)
-            do_assert(x, y, False)
+            y[i] ^= 0xFF
+            do_assert(x, bytes(y), False)
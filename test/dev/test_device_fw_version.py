@@ -21,12 +21,8 @@ from pyshimmer.dev.fw_version import FirmwareVersion, get_firmware_type, EFirmwa
 class DeviceFirmwareVersionTest(TestCase):
 
     def test_get_firmware_type(self):
-        r = get_firmware_type(0x01)
-        self.assertEqual(r, EFirmwareType.BtStream)
-        r = get_firmware_type(0x02)
-        self.assertEqual(r, EFirmwareType.SDLog)
-        r = get_firmware_type(0x03)
-        self.assertEqual(r, EFirmwareType.LogAndStream)
+        r = [get_firmware_type(t) for t in (0x01, 0x02, 0x03)]
+        self.assertEqual(r, [EFirmwareType.BtStream, EFirmwareType.SDLog, EFirmwareType.LogAndStream])
 
         self.assertRaises(ValueError, get_firmware_type, 0xFF)
 
@@ -64,26 +60,15 @@ class FirmwareVersionTest(TestCase):
     def test_greater_less(self):
         a = FirmwareVersion(3, 2, 1)
 
-        b = FirmwareVersion(3, 2, 1)
-        self.assertFalse(b > a)
-        self.assertTrue(b >= a)
-        self.assertFalse(b < a)
-        self.assertTrue(b <= a)
-
-        b = FirmwareVersion(2, 2, 1)
-        self.assertFalse(b > a)
-        self.assertFalse(b >= a)
-        self.assertTrue(b < a)
-        self.assertTrue(b <= a)
-
-        b = FirmwareVersion(3, 1, 1)
-        self.assertFalse(b > a)
-        self.assertFalse(b >= a)
-        self.assertTrue(b < a)
-        self.assertTrue(b <= a)
-
-        b = FirmwareVersion(3, 2, 0)
-        self.assertFalse(b > a)
-        self.assertFalse(b >= a)
-        self.assertTrue(b < a)
-        self.assertTrue(b <= a)
+        # Each entry holds the version to compare against a and the expected results of b > a, b >= a, b < a, b <= a
+        cases = [
+            ((3, 2, 1), (False, True, False, True)),
+            ((2, 2, 1), (False, False, True, True)),
+            ((3, 1, 1), (False, False, True, True)),
+            ((3, 2, 0), (False, False, True, True)),
+            ((3, 2, 2), (True, True, False, False)),
+        ]
+
+        for version, expected in cases:
+            b = FirmwareVersion(*version)
+            self.assertEqual((b > a, b >= a, b < a, b <= a), expected)
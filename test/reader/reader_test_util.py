@@ -13,7 +13,15 @@
 
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
-from pathlib import Path
+import gzip
+import importlib.util
+import io
+import os
+from functools import lru_cache
+from typing import Tuple, BinaryIO
+
+import numpy as np
+import pandas as pd
 
 _res_folder_name = 'resources'
 _single_sample_name = 'single_sample.bin'
@@ -30,32 +38,117 @@ _ecg_sample_bin = 'ecg.bin'
 _ecg_sample_uncal = 'ecg_uncalibrated.csv.gz'
 _ecg_sample_cal = 'ecg_calibrated.csv.gz'
 
+_FIXTURE_BUFFER_SIZE = 64 * 1024
+
+# Absolute tolerance for comparing floating point results, equivalent to the bound of
+# np.testing.assert_almost_equal(..., decimal=7) that the comparisons used before
+ALMOST_EQUAL_ATOL = 1.5e-7
+
+# Arrow's multithreaded CSV parser outperforms np.loadtxt, but is only an optional dependency of pandas
+_HAVE_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+_RES_DIR = os.path.join(_THIS_DIR, _res_folder_name)
+
+
+def _res_path(name: str) -> str:
+    return os.path.join(_RES_DIR, name)
+
+
+_BIN_SAMPLE = _res_path(_single_sample_name)
+_PAIR = _res_path(_pair_raw_name), _res_path(_pair_csv_name)
+_SYNCED_PAIR = _res_path(_synced_pair_bin_name), _res_path(_synced_pair_csv_name)
+_ECG_SAMPLE = _res_path(_ecg_sample_bin), _res_path(_ecg_sample_uncal), _res_path(_ecg_sample_cal)
+_TRIAXCAL = _res_path(_acc_gyro_sample_name), _res_path(_acc_gyro_uncal_name), _res_path(_acc_gyro_cal_name)
+
 
 def get_resources_dir():
-    my_dir = Path(__file__).parent
-    res_dir = my_dir / _res_folder_name
-    return res_dir
+    return _RES_DIR
 
 
 def get_binary_sample_fpath():
-    return get_resources_dir() / _single_sample_name
+    return _BIN_SAMPLE
 
 
 def get_bin_vs_consensys_pair_fpath():
-    res_dir = get_resources_dir()
-    return res_dir / _pair_raw_name, res_dir / _pair_csv_name
+    return _PAIR
 
 
 def get_synced_bin_vs_consensys_pair_fpath():
-    res_dir = get_resources_dir()
-    return res_dir / _synced_pair_bin_name, res_dir / _synced_pair_csv_name
+    return _SYNCED_PAIR
 
 
 def get_ecg_sample():
-    res_dir = get_resources_dir()
-    return res_dir / _ecg_sample_bin, res_dir / _ecg_sample_uncal, res_dir / _ecg_sample_cal
+    return _ECG_SAMPLE
 
 
 def get_triaxcal_sample():
-    res_dir = get_resources_dir()
-    return res_dir / _acc_gyro_sample_name, res_dir / _acc_gyro_uncal_name, res_dir / _acc_gyro_cal_name
+    return _TRIAXCAL
+
+
+def open_fixture(fpath: str) -> BinaryIO:
+    """Open a (compressed) test fixture for reading with a large read buffer
+
+    :param fpath: The path to the fixture, files ending in .gz are decompressed transparently
+    :return: A buffered binary file object
+    """
+    if fpath.endswith('.gz'):
+        return io.BufferedReader(gzip.open(fpath, 'rb'), buffer_size=_FIXTURE_BUFFER_SIZE)
+    return open(fpath, 'rb', buffering=_FIXTURE_BUFFER_SIZE)
+
+
+@lru_cache(maxsize=None)
+def load_fixture_bytes(fpath: str) -> bytes:
+    """Load the entire contents of a test fixture
+
+    The contents are cached, so that the fixtures are read only once even if they are used by multiple test modules.
+
+    :param fpath: The path to the fixture
+    :return: The contents of the file
+    """
+    with open_fixture(fpath) as f:
+        return f.read()
+
+
+def open_cached_fixture(fpath: str) -> BinaryIO:
+    """Open an in-memory copy of a test fixture
+
+    :param fpath: The path to the fixture
+    :return: A seekable binary file object on top of the cached contents
+    """
+    return io.BytesIO(load_fixture_bytes(fpath))
+
+
+def _parse_consensys_csv(csv_path: str, usecols: Tuple[int, ...]) -> np.ndarray:
+    with open_fixture(csv_path) as f:
+        if _HAVE_PYARROW:
+            try:
+                df = pd.read_csv(f, sep='\t', skiprows=3, header=None, usecols=usecols, engine='pyarrow')
+                return df[list(usecols)].to_numpy(dtype=np.float64).T
+            except ValueError:
+                # Arrow rejects exports where only some rows end with a trailing delimiter (ParserError), and pandas
+                # versions before 1.4 do not support the pyarrow engine at all
+                f.seek(0)
+
+        # Without Arrow, the C parser of pandas is not faster than np.loadtxt once it is configured to round the
+        # timestamps correctly, so we stick with the latter.
+        return np.loadtxt(f, delimiter='\t', skiprows=3, usecols=usecols, unpack=True)
+
+
+@lru_cache(maxsize=None)
+def load_consensys_csv(csv_path: str, usecols: Tuple[int, ...]) -> np.ndarray:
+    """Load the selected columns of a (compressed) Consensys CSV export
+
+    Decompressing and parsing the exports is by far the most expensive part of the comparison tests. The parsed
+    array is therefore kept in memory, so that every export is parsed only once per test run.
+
+    :param csv_path: The path to the CSV file, can be gzip-compressed
+    :param usecols: The columns to load
+    :return: A read-only array with shape (len(usecols), N) that holds one column per row
+    """
+    # Store every column contiguously, so that the rows of the array can be compared efficiently
+    data = np.ascontiguousarray(_parse_consensys_csv(csv_path, usecols))
+
+    # The array is shared by all callers and must therefore not be modified
+    data.setflags(write=False)
+    return data
@@ -13,107 +13,125 @@
 
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from unittest import TestCase
 
 import numpy as np
 
 from pyshimmer.dev.channels import ESensorGroup, get_ch_dtypes
 from pyshimmer import EChannelType, ExGRegister
+from pyshimmer.reader.reader_const import DATA_LOG_OFFSET, SYNC_OFFSET_LEN
 from pyshimmer.reader.shimmer_reader import ShimmerBinaryReader
 from .reader_test_util import get_binary_sample_fpath, get_synced_bin_vs_consensys_pair_fpath, get_ecg_sample, \
-    get_triaxcal_sample
+    get_triaxcal_sample, load_fixture_bytes, open_cached_fixture
+
+# Expected ExG register contents of the sample files
+_EXG_REG_DEFAULT_BIN = b'\x00\x80\x10\x00\x00\x00\x00\x00\x02\x01'
+_EXG_REG1_ECG_BIN = b'\x03\xA8\x10\x49\x40\x23\x00\x00\x02\x03'
+_EXG_REG2_ECG_BIN = b'\x03\xA0\x10\xC1\xC1\x00\x00\x00\x02\x01'
+
+_EXG_REG_DEFAULT = ExGRegister(_EXG_REG_DEFAULT_BIN)
+
+
+def setUpModule():
+    # The sample files are independent of each other, so we prefetch them concurrently
+    fpaths = [get_binary_sample_fpath(), get_synced_bin_vs_consensys_pair_fpath()[0], get_ecg_sample()[0],
+              get_triaxcal_sample()[0]]
+    with ThreadPoolExecutor(max_workers=len(fpaths)) as executor:
+        list(executor.map(load_fixture_bytes, fpaths))
+
+
+def _get_equal_stride_ratio(ts: np.ndarray, stride: int) -> float:
+    n_equal = np.count_nonzero(ts[1:] == ts[:-1] + stride)
+    return n_equal / (len(ts) - 1)
 
 
 class ShimmerReaderTest(TestCase):
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        # The readers only parse the file header upon construction and seek to the required position before every
+        # subsequent read. They can therefore safely be shared by all tests of this class.
+        cls.reader_nosync = ShimmerBinaryReader(open_cached_fixture(get_binary_sample_fpath()))
+        cls.reader_sync = ShimmerBinaryReader(open_cached_fixture(get_synced_bin_vs_consensys_pair_fpath()[0]))
+        cls.reader_ecg = ShimmerBinaryReader(open_cached_fixture(get_ecg_sample()[0]))
+        cls.reader_triaxcal = ShimmerBinaryReader(open_cached_fixture(get_triaxcal_sample()[0]))
+
     def test_parsing_wo_sync(self):
-        fpath = get_binary_sample_fpath()
-        with open(fpath, 'rb') as f:
-            reader = ShimmerBinaryReader(f)
-
-            exp_dr = 65
-            exp_sensors = [ESensorGroup.ACCEL_LN, ESensorGroup.BATTERY, ESensorGroup.CH_A13]
-            exp_channels = [EChannelType.TIMESTAMP, EChannelType.ACCEL_LN_X, EChannelType.ACCEL_LN_Y,
-                            EChannelType.ACCEL_LN_Z, EChannelType.VBATT, EChannelType.INTERNAL_ADC_13]
-
-            sample_size = sum([dt.size for dt in get_ch_dtypes(exp_channels)])
-            samples_per_block = int(512 / sample_size)
-            block_size = samples_per_block * sample_size
-
-            self.assertEqual(reader.enabled_sensors, exp_sensors)
-            self.assertEqual(reader.enabled_channels, exp_channels)
-            self.assertEqual(reader.sample_rate, exp_dr)
-            self.assertEqual(reader.has_global_clock, True)
-            self.assertEqual(reader.has_sync, False)
-            self.assertEqual(reader.is_sync_master, False)
-            self.assertEqual(reader.samples_per_block, samples_per_block)
-            self.assertEqual(reader.start_timestamp, 31291951)
-            self.assertEqual(reader.block_size, block_size)
-            self.assertEqual(reader.exg_reg1.binary, b'\x00\x80\x10\x00\x00\x00\x00\x00\x02\x01')
-            self.assertEqual(reader.exg_reg2.binary, b'\x00\x80\x10\x00\x00\x00\x00\x00\x02\x01')
-
-            data, _ = reader.read_data()
-            ts = data[EChannelType.TIMESTAMP]
-
-            # Sanity check on the timestamps: they should all be spaced equally apart with a stride that is equal
-            # to the sampling rate.
-            ts_diff = np.diff(ts)
-            correct_diff = np.sum(ts_diff == exp_dr)
-            self.assertTrue(correct_diff / len(ts_diff) > 0.98)
+        reader = self.reader_nosync
+
+        exp_dr = 65
+        exp_sensors = [ESensorGroup.ACCEL_LN, ESensorGroup.BATTERY, ESensorGroup.CH_A13]
+        exp_channels = [EChannelType.TIMESTAMP, EChannelType.ACCEL_LN_X, EChannelType.ACCEL_LN_Y,
+                        EChannelType.ACCEL_LN_Z, EChannelType.VBATT, EChannelType.INTERNAL_ADC_13]
+
+        sample_size = sum([dt.size for dt in get_ch_dtypes(exp_channels)])
+        samples_per_block = int(512 / sample_size)
+        block_size = samples_per_block * sample_size
+
+        self.assertEqual(reader.enabled_sensors, exp_sensors)
+        self.assertEqual(reader.enabled_channels, exp_channels)
+        self.assertEqual(reader.sample_rate, exp_dr)
+        self.assertEqual(reader.has_global_clock, True)
+        self.assertEqual(reader.has_sync, False)
+        self.assertEqual(reader.is_sync_master, False)
+        self.assertEqual(reader.samples_per_block, samples_per_block)
+        self.assertEqual(reader.start_timestamp, 31291951)
+        self.assertEqual(reader.block_size, block_size)
+        self.assertEqual(reader.exg_reg1.binary, _EXG_REG_DEFAULT_BIN)
+        self.assertEqual(reader.exg_reg2.binary, _EXG_REG_DEFAULT_BIN)
+
+        data, _ = reader.read_data()
+        ts = data[EChannelType.TIMESTAMP]
+
+        # Sanity check on the timestamps: they should all be spaced equally apart with a stride that is equal
+        # to the sampling rate.
+        self.assertTrue(_get_equal_stride_ratio(ts, exp_dr) > 0.98)
 
     def test_parsing_w_sync(self):
-        fpath, _ = get_synced_bin_vs_consensys_pair_fpath()
-        with open(fpath, 'rb') as f:
-            reader = ShimmerBinaryReader(f)
-
-            exp_dr = 64
-            exp_sensors = [ESensorGroup.CH_A13]
-            exp_channels = [EChannelType.TIMESTAMP, EChannelType.INTERNAL_ADC_13]
-            exp_offsets = np.array([372, 362, 364, 351])
-            exp_sync_ts = np.array([3725366, 4071094, 4397558, 4724022])
-            exp_exg_reg1 = ExGRegister(b'\x00\x80\x10\x00\x00\x00\x00\x00\x02\x01')
-            exp_exg_reg2 = ExGRegister(b'\x00\x80\x10\x00\x00\x00\x00\x00\x02\x01')
-
-            sample_size = sum([dt.size for dt in get_ch_dtypes(exp_channels)])
-            samples_per_block = int((512 - 9) / sample_size)
-            block_size = samples_per_block * sample_size + 9
-
-            self.assertEqual(reader.has_global_clock, True)
-            self.assertEqual(reader.has_sync, True)
-            self.assertEqual(reader.is_sync_master, False)
-            self.assertEqual(reader.enabled_sensors, exp_sensors)
-            self.assertEqual(reader.enabled_channels, exp_channels)
-            self.assertEqual(reader.sample_rate, exp_dr)
-            self.assertEqual(reader.samples_per_block, samples_per_block)
-            self.assertEqual(reader.start_timestamp, 3085110)
-            self.assertEqual(reader.block_size, block_size)
-
-            self.assertEqual(reader.get_exg_reg(0), exp_exg_reg1)
-            self.assertEqual(reader.get_exg_reg(1), exp_exg_reg2)
-            self.assertEqual(reader.exg_reg1, exp_exg_reg1)
-            self.assertEqual(reader.exg_reg2, exp_exg_reg2)
-
-            samples, (off_index, sync_off) = reader.read_data()
-            ts = samples[EChannelType.TIMESTAMP]
-
-            np.testing.assert_equal(ts[off_index], exp_sync_ts)
-            np.testing.assert_equal(sync_off, exp_offsets)
-
-            # Sanity check on the timestamps: they should all be spaced equally apart with a stride that is equal
-            # to the sampling rate.
-            ts = samples[EChannelType.TIMESTAMP]
-            ts_diff = np.diff(ts)
-            correct_diff = np.sum(ts_diff == exp_dr)
-            self.assertTrue(correct_diff / len(ts_diff) > 0.98)
+        reader = self.reader_sync
+
+        exp_dr = 64
+        exp_sensors = [ESensorGroup.CH_A13]
+        exp_channels = [EChannelType.TIMESTAMP, EChannelType.INTERNAL_ADC_13]
+        exp_offsets = np.array([372, 362, 364, 351])
+        exp_sync_ts = np.array([3725366, 4071094, 4397558, 4724022])
+
+        sample_size = sum([dt.size for dt in get_ch_dtypes(exp_channels)])
+        samples_per_block = int((512 - 9) / sample_size)
+        block_size = samples_per_block * sample_size + 9
+
+        self.assertEqual(reader.has_global_clock, True)
+        self.assertEqual(reader.has_sync, True)
+        self.assertEqual(reader.is_sync_master, False)
+        self.assertEqual(reader.enabled_sensors, exp_sensors)
+        self.assertEqual(reader.enabled_channels, exp_channels)
+        self.assertEqual(reader.sample_rate, exp_dr)
+        self.assertEqual(reader.samples_per_block, samples_per_block)
+        self.assertEqual(reader.start_timestamp, 3085110)
+        self.assertEqual(reader.block_size, block_size)
+
+        self.assertEqual(reader.get_exg_reg(0), _EXG_REG_DEFAULT)
+        self.assertEqual(reader.get_exg_reg(1), _EXG_REG_DEFAULT)
+        self.assertEqual(reader.exg_reg1, _EXG_REG_DEFAULT)
+        self.assertEqual(reader.exg_reg2, _EXG_REG_DEFAULT)
+
+        samples, (off_index, sync_off) = reader.read_data()
+        ts = samples[EChannelType.TIMESTAMP]
+
+        np.testing.assert_equal(ts[off_index], exp_sync_ts)
+        np.testing.assert_equal(sync_off, exp_offsets)
+
+        # Sanity check on the timestamps: they should all be spaced equally apart with a stride that is equal
+        # to the sampling rate.
+        self.assertTrue(_get_equal_stride_ratio(ts, exp_dr) > 0.98)
 
     def test_ecg_registers(self):
-        fpath, _, _ = get_ecg_sample()
-        with open(fpath, 'rb') as f:
-            reader = ShimmerBinaryReader(f)
-            self.assertEqual(reader.exg_reg1.binary, b'\x03\xA8\x10\x49\x40\x23\x00\x00\x02\x03')
-            self.assertEqual(reader.exg_reg2.binary, b'\x03\xA0\x10\xC1\xC1\x00\x00\x00\x02\x01')
+        reader = self.reader_ecg
+        self.assertEqual(reader.exg_reg1.binary, _EXG_REG1_ECG_BIN)
+        self.assertEqual(reader.exg_reg2.binary, _EXG_REG2_ECG_BIN)
 
-    # noinspection PyMethodMayBeStatic
     def test_accel_ln_calib_data(self):
         exp_params = {
             ESensorGroup.ACCEL_LN: (
@@ -132,12 +150,34 @@ class ShimmerReaderTest(TestCase):
             )
         }
 
-        fpath, _, _ = get_triaxcal_sample()
-        with open(fpath, 'rb') as f:
-            reader = ShimmerBinaryReader(f)
+        reader = self.reader_triaxcal
 
-            for sensor, (exp_offset, exp_gain, exp_alignment) in exp_params.items():
-                offset, gain, alignment = reader.get_triaxcal_params(sensor)
-                np.testing.assert_almost_equal(offset, exp_offset, decimal=10)
-                np.testing.assert_almost_equal(gain, exp_gain, decimal=10)
-                np.testing.assert_almost_equal(alignment, exp_alignment, decimal=10)
+        for sensor, (exp_offset, exp_gain, exp_alignment) in exp_params.items():
+            offset, gain, alignment = reader.get_triaxcal_params(sensor)
+            np.testing.assert_almost_equal(offset, exp_offset, decimal=10)
+            np.testing.assert_almost_equal(gain, exp_gain, decimal=10)
+            np.testing.assert_almost_equal(alignment, exp_alignment, decimal=10)
+
+    def test_partial_block(self):
+        fpath, _ = get_synced_bin_vs_consensys_pair_fpath()
+        full_samples, (full_index, full_offsets) = self.reader_sync.read_data()
+        block_size = self.reader_sync.block_size
+        sample_size = sum(dt.size for dt in get_ch_dtypes(self.reader_sync.enabled_channels))
+
+        # Cut the file in the middle of the last block such that it holds the synchronization offset, a few complete
+        # samples and a single byte of a partial sample
+        n_tail_samples = 3
+        sample_bin = load_fixture_bytes(fpath)
+        n_blocks = (len(sample_bin) - DATA_LOG_OFFSET) // block_size
+        cut_len = DATA_LOG_OFFSET + (n_blocks - 1) * block_size + SYNC_OFFSET_LEN + n_tail_samples * sample_size + 1
+
+        reader = ShimmerBinaryReader(BytesIO(sample_bin[:cut_len]))
+        samples, (off_index, offsets) = reader.read_data()
+
+        n_samples = (n_blocks - 1) * reader.samples_per_block + n_tail_samples
+        for ch in reader.enabled_channels:
+            np.testing.assert_equal(samples[ch], full_samples[ch][:n_samples])
+
+        n_offsets = np.count_nonzero(full_index <= n_samples)
+        np.testing.assert_equal(off_index, full_index[:n_offsets])
+        np.testing.assert_equal(offsets, full_offsets[:n_offsets])
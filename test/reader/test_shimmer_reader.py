@@ -27,11 +27,41 @@ from pyshimmer.dev.exg import get_exg_ch
 from pyshimmer.reader.binary_reader import ShimmerBinaryReader
 from pyshimmer.reader.shimmer_reader import ShimmerReader, SingleChannelProcessor, PPGProcessor, TriAxCalProcessor
 from .reader_test_util import get_bin_vs_consensys_pair_fpath, get_synced_bin_vs_consensys_pair_fpath, get_ecg_sample, \
-    get_triaxcal_sample
+    get_triaxcal_sample, load_consensys_csv, open_cached_fixture, ALMOST_EQUAL_ATOL
+
+_RNG = np.random.default_rng(12345)
+
+_EXG_REG1 = ExGRegister(bytes(range(10)))
+_EXG_REG2 = ExGRegister(bytes(range(10, 0, -1)))
+
+# Properties of a binary reader for a plain recording without synchronization or global clock
+_MOCK_BR_DEFAULTS = {
+    'sample_rate': 1,
+    'enabled_sensors': [],
+    'has_sync': False,
+    'has_global_clock': False,
+    'start_timestamp': 0,
+}
+
+
+def _make_mock_br(**props) -> Mock:
+    m_br = Mock(spec=ShimmerBinaryReader)
+    for name, value in {**_MOCK_BR_DEFAULTS, **props}.items():
+        setattr(type(m_br), name, PropertyMock(return_value=value))
+
+    return m_br
 
 
 class ShimmerReaderTest(TestCase):
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        # A long recording in which the device timestamps wrap around multiple times
+        cls.unwrap_sr = 65
+        cls.unwrap_ts_dev = np.arange(0, 4 * (2 ** 24), cls.unwrap_sr)
+        cls.unwrap_ts_dev_wrapped = cls.unwrap_ts_dev % 2 ** 24
+        cls.unwrap_vbatt = _RNG.integers(0, 100 + 1, len(cls.unwrap_ts_dev))
+
     def test_reader_timestep_interpolation(self):
         sr = 5
         ts_dev = np.array([0, 5, 10, 15, 21, 25, 29, 35])
@@ -42,13 +72,8 @@ class ShimmerReaderTest(TestCase):
             EChannelType.VBATT: vbatt,
         }
 
-        m_br = Mock(spec=ShimmerBinaryReader)
+        m_br = _make_mock_br(sample_rate=sr)
         m_br.read_data.return_value = (samples, [])
-        type(m_br).sample_rate = PropertyMock(return_value=sr)
-        type(m_br).enabled_sensors = PropertyMock(return_value=[])
-        type(m_br).has_sync = PropertyMock(return_value=False)
-        type(m_br).has_global_clock = PropertyMock(return_value=False)
-        type(m_br).start_timestamp = PropertyMock(return_value=0)
 
         reader = ShimmerReader(bin_reader=m_br)
         reader.load_file_data()
@@ -57,22 +82,17 @@ class ShimmerReaderTest(TestCase):
         self.assertEqual(len(ts_aligned), len(ts))
 
         vbatt_aligned = reader[EChannelType.VBATT]
-        np.testing.assert_equal(vbatt[ts_aligned == ts], vbatt_aligned[ts_aligned == ts])
+        ts_equal = ts_aligned == ts
+        np.testing.assert_equal(vbatt[ts_equal], vbatt_aligned[ts_equal])
 
     def test_timestamp_unwrapping(self):
-        sr = 65
-        ts_dev = np.arange(0, 4 * (2 ** 24), sr)
-        ts_dev_wrapped = ts_dev % 2 ** 24
+        sr = self.unwrap_sr
+        ts_dev_wrapped = self.unwrap_ts_dev_wrapped
 
-        ts = ticks2sec(ts_dev)
-        vbatt = np.random.randint(0, 100 + 1, len(ts_dev))
+        ts = ticks2sec(self.unwrap_ts_dev)
+        vbatt = self.unwrap_vbatt
 
-        m_br = Mock(spec=ShimmerBinaryReader)
-        type(m_br).has_sync = PropertyMock(return_value=False)
-        type(m_br).enabled_sensors = PropertyMock(return_value=[])
-        type(m_br).sample_rate = PropertyMock(return_value=sr)
-        type(m_br).has_global_clock = PropertyMock(return_value=False)
-        type(m_br).start_timestamp = PropertyMock(return_value=0)
+        m_br = _make_mock_br(sample_rate=sr)
 
         samples = {
             EChannelType.VBATT: vbatt,
@@ -85,7 +105,7 @@ class ShimmerReaderTest(TestCase):
 
         ts_actual = reader.timestamp
         self.assertEqual(len(ts_actual), len(ts))
-        np.testing.assert_almost_equal(ts_actual, ts)
+        np.testing.assert_allclose(ts_actual, ts, rtol=0, atol=ALMOST_EQUAL_ATOL)
         np.testing.assert_equal(reader[EChannelType.VBATT], vbatt)
         np.testing.assert_equal(reader.timestamp, reader[EChannelType.TIMESTAMP])
 
@@ -101,23 +121,19 @@ class ShimmerReaderTest(TestCase):
         sync_index = np.array([0, len(ts) - 1])
         sync_offset = np.array([1, 0])
 
-        m_br = Mock(spec=ShimmerBinaryReader)
+        m_br = _make_mock_br(sample_rate=sr, has_sync=True)
         m_br.read_data.return_value = (samples, [sync_index, sync_offset])
-        type(m_br).sample_rate = PropertyMock(return_value=sr)
-        type(m_br).enabled_sensors = PropertyMock(return_value=[])
-        type(m_br).has_sync = PropertyMock(return_value=True)
-        type(m_br).has_global_clock = PropertyMock(return_value=False)
-        type(m_br).start_timestamp = PropertyMock(return_value=0)
 
         reader = ShimmerReader(bin_reader=m_br)
         reader.load_file_data()
 
-        ts_sync_dev = ts - np.linspace(1, 0, len(ts))
+        # The offsets decrease linearly from 1 at the first to 0 at the last synchronization index
+        ts_sync_dev = ts - (1.0 - np.arange(len(ts)) / (len(ts) - 1))
         exp_ts = ticks2sec(ts_sync_dev)
         act_ts = reader.timestamp
 
         self.assertEqual(len(exp_ts), len(act_ts))
-        np.testing.assert_almost_equal(act_ts, exp_ts)
+        np.testing.assert_allclose(act_ts, exp_ts, rtol=0, atol=ALMOST_EQUAL_ATOL)
         np.testing.assert_equal(vbatt, reader[EChannelType.VBATT])
 
     # noinspection PyMethodMayBeStatic
@@ -128,22 +144,20 @@ class ShimmerReaderTest(TestCase):
         exp_channels = [EChannelType.ACCEL_LN_X, EChannelType.ACCEL_LN_Y, EChannelType.ACCEL_LN_Z, EChannelType.VBATT,
                         EChannelType.INTERNAL_ADC_13]
 
-        with open(raw_file, 'rb') as f:
+        with open_cached_fixture(raw_file) as f:
             reader = ShimmerReader(f)
             reader.load_file_data()
 
         self.assertEqual(exp_channels, reader.channels)
         self.assertAlmostEqual(exp_sr, reader.sample_rate, 2)
 
-        r = np.loadtxt(csv_file, delimiter='\t', skiprows=3, usecols=(0, 1))
-        expected_ts = r[:, 0]
-        expected_ppg = r[:, 1]
+        expected_ts, expected_ppg = load_consensys_csv(csv_file, usecols=(0, 1))
 
         actual_ts = reader.timestamp * 1000  # needs to be in ms
         actual_ppg = reader[EChannelType.INTERNAL_ADC_13] * 1000.0  # needs to be in mV
 
-        np.testing.assert_almost_equal(actual_ts.flatten(), expected_ts.flatten())
-        np.testing.assert_almost_equal(actual_ppg, expected_ppg)
+        np.testing.assert_allclose(actual_ts.flatten(), expected_ts.flatten(), rtol=0, atol=ALMOST_EQUAL_ATOL)
+        np.testing.assert_allclose(actual_ppg, expected_ppg, rtol=0, atol=ALMOST_EQUAL_ATOL)
 
     def test_compare_sync_processing_to_consensys(self):
         bin_path, csv_path = get_synced_bin_vs_consensys_pair_fpath()
@@ -151,33 +165,27 @@ class ShimmerReaderTest(TestCase):
         exp_sr = 512.0
         exp_channels = [EChannelType.INTERNAL_ADC_13]
 
-        with open(bin_path, 'rb') as f:
+        with open_cached_fixture(bin_path) as f:
             reader = ShimmerReader(f, sync=True)
             reader.load_file_data()
 
-        csv_data = np.loadtxt(csv_path, delimiter='\t', skiprows=3, usecols=(0, 1))
-        expected_ts = csv_data[:, 0]
-        expected_ppg = csv_data[:, 1]
+        expected_ts, expected_ppg = load_consensys_csv(csv_path, usecols=(0, 1))
 
         actual_ts = reader.timestamp * 1000
         actual_ppg = reader[EChannelType.INTERNAL_ADC_13] * 1000.0  # needs to be in mV
 
         self.assertEqual(exp_channels, reader.channels)
         self.assertEqual(exp_sr, reader.sample_rate)
-        np.testing.assert_almost_equal(actual_ts.flatten(), expected_ts.flatten())
-        np.testing.assert_almost_equal(actual_ppg.flatten(), expected_ppg.flatten())
+        np.testing.assert_allclose(actual_ts.flatten(), expected_ts.flatten(), rtol=0, atol=ALMOST_EQUAL_ATOL)
+        np.testing.assert_allclose(actual_ppg.flatten(), expected_ppg.flatten(), rtol=0, atol=ALMOST_EQUAL_ATOL)
 
     def test_reader_exg_register(self):
-        exp_reg1_content = bytes(range(10))
-        exp_reg1 = ExGRegister(exp_reg1_content)
-        exp_reg2_content = bytes(range(10, 0, -1))
-        exp_reg2 = ExGRegister(exp_reg2_content)
+        exp_reg1 = _EXG_REG1
+        exp_reg2 = _EXG_REG2
         exp_regs = [exp_reg1, exp_reg2]
 
-        m_br = Mock(spec=ShimmerBinaryReader)
+        m_br = _make_mock_br(exg_reg1=exp_reg1, exg_reg2=exp_reg2)
         m_br.get_exg_reg.side_effect = lambda x: exp_regs[x]
-        type(m_br).exg_reg1 = PropertyMock(return_value=exp_reg1)
-        type(m_br).exg_reg2 = PropertyMock(return_value=exp_reg2)
         reader = ShimmerReader(bin_reader=m_br)
 
         for i in range(2):
@@ -200,25 +208,20 @@ class ShimmerReaderTest(TestCase):
             1: exg2_gain,
         }
 
+        exg_data = _RNG.standard_normal((4, 1000))
         samples = {
-            EChannelType.EXG_ADS1292R_1_CH1_24BIT: np.random.randn(1000),
-            EChannelType.EXG_ADS1292R_2_CH2_24BIT: np.random.randn(1000),
-            EChannelType.EXG_ADS1292R_1_CH1_16BIT: np.random.randn(1000),
-            EChannelType.EXG_ADS1292R_2_CH2_16BIT: np.random.randn(1000),
+            EChannelType.EXG_ADS1292R_1_CH1_24BIT: exg_data[0],
+            EChannelType.EXG_ADS1292R_2_CH2_24BIT: exg_data[1],
+            EChannelType.EXG_ADS1292R_1_CH1_16BIT: exg_data[2],
+            EChannelType.EXG_ADS1292R_2_CH2_16BIT: exg_data[3],
         }
 
         samples_w_ts = {**samples, EChannelType.TIMESTAMP: np.arange(1000)}
 
-        m_br = Mock(spec=ShimmerBinaryReader)
+        m_br = _make_mock_br(exg_reg1=exg_reg1, exg_reg2=exg_reg2)
         m_br.get_exg_reg.side_effect = lambda x: exg_reg1 if x == 0 else exg_reg2
+        # The reader pops the timestamps from the returned dict, so each call needs its own shallow copy
         m_br.read_data.side_effect = lambda: (dict(samples_w_ts), ((), ()))
-        type(m_br).sample_rate = PropertyMock(return_value=1)
-        type(m_br).enabled_sensors = PropertyMock(return_value=[])
-        type(m_br).has_sync = PropertyMock(return_value=False)
-        type(m_br).has_global_clock = PropertyMock(return_value=False)
-        type(m_br).start_timestamp = PropertyMock(return_value=0)
-        type(m_br).exg_reg1 = PropertyMock(return_value=exg_reg1)
-        type(m_br).exg_reg2 = PropertyMock(return_value=exg_reg2)
 
         reader = ShimmerReader(bin_reader=m_br, post_process=False)
         reader.load_file_data()
@@ -233,25 +236,25 @@ class ShimmerReaderTest(TestCase):
             gain = chip_gain[get_exg_ch(ch)[0]]
             expected = (samples[ch] - 0) * 2.420 / (2 ** (bit - 1) - 1) / gain
             actual = reader[ch]
-            np.testing.assert_almost_equal(actual, expected)
+            np.testing.assert_allclose(actual, expected, rtol=0, atol=ALMOST_EQUAL_ATOL)
 
     # noinspection PyMethodMayBeStatic
     def test_compare_exg_processing_to_consensys(self):
         bin_path, uncal_path, cal_path = get_ecg_sample()
 
         def verify(bin_file_path, expected, post_process):
-            with open(bin_file_path, 'rb') as f:
+            with open_cached_fixture(bin_file_path) as f:
                 reader = ShimmerReader(f, post_process=post_process, sync=False)
                 reader.load_file_data()
 
             actual = reader[EChannelType.EXG_ADS1292R_1_CH1_24BIT]
-            np.testing.assert_almost_equal(actual, expected[1])
+            np.testing.assert_allclose(actual, expected[1], rtol=0, atol=ALMOST_EQUAL_ATOL)
 
             actual = reader[EChannelType.EXG_ADS1292R_1_CH2_24BIT]
-            np.testing.assert_almost_equal(actual, expected[2])
+            np.testing.assert_allclose(actual, expected[2], rtol=0, atol=ALMOST_EQUAL_ATOL)
 
-        expected_uncal = np.loadtxt(uncal_path, delimiter='\t', skiprows=3, usecols=(0, 1, 2)).T
-        expected_cal = np.loadtxt(cal_path, delimiter='\t', skiprows=3, usecols=(0, 1, 2)).T / 1000.0  # Volt
+        expected_uncal = load_consensys_csv(uncal_path, usecols=(0, 1, 2))
+        expected_cal = load_consensys_csv(cal_path, usecols=(0, 1, 2)) / 1000.0  # Volt
 
         verify(bin_path, expected_uncal, post_process=False)
         verify(bin_path, expected_cal, post_process=True)
@@ -276,14 +279,14 @@ class ShimmerReaderTest(TestCase):
             EChannelType.MAG_LSM303DLHC_Z: "Shimmer_952D_Mag_Z_CAL",
         }
 
-        with open(bin_path, 'rb') as f:
+        with open_cached_fixture(bin_path) as f:
             reader = ShimmerReader(f)
             reader.load_file_data()
 
             for rdr_col, csv_col in col_mapping.items():
                 rdr_channel = reader[rdr_col]
                 csv_channel = consensys_csv[csv_col]
-                np.testing.assert_almost_equal(rdr_channel, csv_channel.to_numpy())
+                np.testing.assert_allclose(rdr_channel, csv_channel.to_numpy(), rtol=0, atol=ALMOST_EQUAL_ATOL)
 
 
 class SignalPostProcessorTest(TestCase):
@@ -305,11 +308,12 @@ class SignalPostProcessorTest(TestCase):
             def seen(self) -> Set[EChannelType]:
                 return set(self._seen)
 
+        data = _RNG.standard_normal((4, 10))
         ch_data = {
-            EChannelType.TIMESTAMP: np.random.randn(10),
-            EChannelType.VBATT: np.random.randn(10),
-            EChannelType.INTERNAL_ADC_13: np.random.randn(10),
-            EChannelType.ACCEL_LN_X: np.random.randn(10),
+            EChannelType.TIMESTAMP: data[0],
+            EChannelType.VBATT: data[1],
+            EChannelType.INTERNAL_ADC_13: data[2],
+            EChannelType.ACCEL_LN_X: data[3],
         }
         ch_types = set(ch_data.keys())
 
@@ -331,12 +335,13 @@ class SignalPostProcessorTest(TestCase):
 
     # noinspection PyMethodMayBeStatic
     def test_ppg_processor(self):
-        ppg_data = np.random.randn(10)
+        data = _RNG.standard_normal((4, 10))
+        ppg_data = data[2]
         ch_data = {
-            EChannelType.TIMESTAMP: np.random.randn(10),
-            EChannelType.VBATT: np.random.randn(10),
+            EChannelType.TIMESTAMP: data[0],
+            EChannelType.VBATT: data[1],
             EChannelType.INTERNAL_ADC_13: ppg_data,
-            EChannelType.ACCEL_LN_X: np.random.randn(10),
+            EChannelType.ACCEL_LN_X: data[3],
         }
 
         proc = PPGProcessor()
@@ -347,7 +352,7 @@ class SignalPostProcessorTest(TestCase):
             if ch != EChannelType.INTERNAL_ADC_13:
                 np.testing.assert_equal(y, ch_data[ch])
             else:
-                np.testing.assert_equal(y, ppg_data / 1000.0)
+                np.testing.assert_allclose(y, ppg_data / 1000.0, rtol=1e-15)
 
     # noinspection PyMethodMayBeStatic
     def test_triaxcal_processor(self):
@@ -356,12 +361,11 @@ class SignalPostProcessorTest(TestCase):
 
         ch_types = get_enabled_channels(list(params.keys()))
 
-        data_arr = np.random.randn(3, 100)
+        data_arr = _RNG.standard_normal((3, 100))
         data_dict = {c: data_arr[i] for i, c in enumerate(ch_types)}
 
-        mock_reader = Mock(spec=ShimmerBinaryReader)
+        mock_reader = _make_mock_br(enabled_sensors=list(params.keys()))
         mock_reader.get_triaxcal_params.side_effect = lambda x: params[x]
-        type(mock_reader).enabled_sensors = PropertyMock(return_value=list(params.keys()))
 
         proc = TriAxCalProcessor()
         actual_dict = proc.process(data_dict, mock_reader)
@@ -370,4 +374,30 @@ class SignalPostProcessorTest(TestCase):
         k = np.matmul(np.linalg.inv(a), np.linalg.inv(g))
         exp_arr = np.matmul(k, data_arr - o[..., None])
 
-        np.testing.assert_almost_equal(actual_arr, exp_arr)
+        np.testing.assert_allclose(actual_arr, exp_arr, rtol=0, atol=ALMOST_EQUAL_ATOL)
+
+    def test_triaxcal_processor_multiple_sensors(self):
+        params = {
+            ESensorGroup.ACCEL_LN: (np.array([1, 2, 3]), np.diag([4, 5, 6]), np.diag([7, 8, 9])),
+            ESensorGroup.GYRO: (np.array([-4, 5, 0]), np.diag([3, 2, 1]), np.array([[0, 1, 0], [1, 0, 0], [0, 0, -1]])),
+        }
+
+        sensor_channels = {s: get_enabled_channels([s]) for s in params}
+        data_dict = {c: _RNG.standard_normal(100) for chs in sensor_channels.values() for c in chs}
+        data_dict[EChannelType.VBATT] = _RNG.standard_normal(100)
+
+        mock_reader = _make_mock_br(enabled_sensors=list(params.keys()) + [ESensorGroup.BATTERY])
+        mock_reader.get_triaxcal_params.side_effect = lambda x: params[x]
+
+        proc = TriAxCalProcessor()
+        actual_dict = proc.process(data_dict, mock_reader)
+
+        np.testing.assert_equal(actual_dict[EChannelType.VBATT], data_dict[EChannelType.VBATT])
+        for sensor, (o, g, a) in params.items():
+            chs = sensor_channels[sensor]
+            data_arr = np.stack([data_dict[c] for c in chs])
+            actual_arr = np.stack([actual_dict[c] for c in chs])
+
+            k = np.matmul(np.linalg.inv(a), np.linalg.inv(g))
+            exp_arr = np.matmul(k, data_arr - o[..., None])
+            np.testing.assert_allclose(actual_arr, exp_arr, rtol=0, atol=ALMOST_EQUAL_ATOL)
@@ -18,6 +18,7 @@ from unittest import TestCase
 import numpy as np
 
 from pyshimmer.reader.shimmer_reader import unwrap_device_timestamps, fit_linear_1d
+from .reader_test_util import ALMOST_EQUAL_ATOL
 
 
 # noinspection PyMethodMayBeStatic
@@ -34,6 +35,12 @@ class UtilTest(TestCase):
         actual = unwrap_device_timestamps(ts_wrapped)
         np.testing.assert_equal(actual, expected)
 
+        # The input must not be modified, even if its data type cannot hold the unwrapped values
+        ts_wrapped = np.array([0, 10, 20, 30, 5, 15, 25, 35], dtype=np.uint32)
+        actual = unwrap_device_timestamps(ts_wrapped)
+        np.testing.assert_equal(actual, expected)
+        np.testing.assert_equal(ts_wrapped, [0, 10, 20, 30, 5, 15, 25, 35])
+
     def test_fit_linear_1d(self):
         x = np.array([0, 1])
         y = np.array([0, 10])
@@ -41,9 +48,29 @@ class UtilTest(TestCase):
 
         yi_expected = np.array([0, 2.5, 5, 7.5, 10])
         yi_actual = fit_linear_1d(x, y, xi)
-        np.testing.assert_almost_equal(yi_actual, yi_expected)
+        np.testing.assert_allclose(yi_actual, yi_expected, rtol=0, atol=ALMOST_EQUAL_ATOL)
 
         xi = 0.1
         yi_expected = 1.0
         yi_actual = fit_linear_1d(x, y, xi)
-        np.testing.assert_almost_equal(yi_actual, yi_expected)
+        np.testing.assert_allclose(yi_actual, yi_expected, rtol=0, atol=ALMOST_EQUAL_ATOL)
+
+        # With more than two points, the result must match a least squares fit
+        x = np.array([0, 10, 20, 30, 40])
+        y = np.array([372, 362, 364, 351, 355])
+        xi = np.array([0, 5, 25, 50])
+
+        yi_expected = np.poly1d(np.polyfit(x, y, 1))(xi)
+        yi_actual = fit_linear_1d(x, y, xi)
+        np.testing.assert_allclose(yi_actual, yi_expected, rtol=0, atol=ALMOST_EQUAL_ATOL)
+
+    def test_fit_linear_1d_degenerate(self):
+        xi = np.array([0, 1000, 2000])
+
+        # A single point results in a constant
+        yi_actual = fit_linear_1d(np.array([1000.0]), np.array([372.0]), xi)
+        np.testing.assert_equal(yi_actual, [372.0, 372.0, 372.0])
+
+        # The same applies to multiple points that share the same x value
+        yi_actual = fit_linear_1d(np.array([1000.0, 1000.0]), np.array([372.0, 362.0]), xi)
+        np.testing.assert_equal(yi_actual, [367.0, 367.0, 367.0])
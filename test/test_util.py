@@ -18,11 +18,11 @@ from pyshimmer.util import PeekQueue
 
 import numpy as np
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from io import BytesIO
 from pyshimmer.util import bit_is_set, raise_to_next_pow, flatten_list, fmt_hex, unpack, unwrap, calibrate_u12_adc_value, battery_voltage_to_percent, \
-     FileIOBase
+     FileIOBase, get_struct
 
 
 class UtilTest(TestCase):
@@ -82,6 +82,12 @@ class UtilTest(TestCase):
         r = fmt_hex(b'\x01\x02')
         self.assertEqual(r, '01 02')
 
+    def test_get_struct(self):
+        s = get_struct('<HB')
+        self.assertEqual(s.format, '<HB')
+        self.assertEqual(s.size, 3)
+        self.assertIs(get_struct('<HB'), s)
+
     def test_unpack(self):
         r = unpack([10])
 
@@ -129,6 +135,42 @@ class UtilTest(TestCase):
         r = unwrap(x, 2 ** 24)
         np.testing.assert_equal(r, e)
 
+        # The input must remain unchanged and narrow integer types must not overflow
+        x = np.array([0, 200, 100, 250, 10], dtype=np.uint8)
+        e = np.array([0, 200, 356, 506, 522])
+
+        r = unwrap(x, 256)
+        np.testing.assert_equal(r, e)
+        np.testing.assert_equal(x, [0, 200, 100, 250, 10])
+        self.assertEqual(r.dtype, np.int64)
+
+        # 64bit inputs keep their data type and precision
+        e = np.array([2 ** 53 + 1, 2 ** 53 + 3, 2 ** 53 + 2 ** 41 + 1, 2 ** 53 + 2 ** 41 + 3], dtype=np.uint64)
+        x = e.copy()
+        x[2:] -= np.uint64(2 ** 41)
+
+        r = unwrap(x, 2 ** 41)
+        self.assertEqual(r.dtype, np.uint64)
+        np.testing.assert_equal(r, e)
+
+    # noinspection PyMethodMayBeStatic
+    def test_unwrap_many_wraps(self):
+        # On platforms where the default integer type is 32bit wide, counting the overflows in that type causes the
+        # offset to overflow after 128 wraps of a 24bit clock. We emulate such a platform by overriding the default
+        # data type of np.cumsum.
+        np_cumsum = np.cumsum
+
+        def cumsum_int32_default(a, axis=None, dtype=None, out=None):
+            return np_cumsum(a, axis=axis, dtype=np.int32 if dtype is None else dtype, out=out)
+
+        e = np.arange(0, 200 * 2 ** 24, 2 ** 22)
+        x = (e % 2 ** 24).astype(np.uint32)
+
+        with patch.object(np, 'cumsum', side_effect=cumsum_int32_default):
+            r = unwrap(x, 2 ** 24)
+
+        np.testing.assert_equal(r, e)
+
     def test_calibrate_u12_adc_value(self):
         uncalibratedData = 2863
         offset = 0
@@ -147,6 +189,12 @@ class UtilTest(TestCase):
         actual = battery_voltage_to_percent(voltage)
         np.testing.assert_equal(actual, desired)
 
+        voltages = np.array([3.0, 3.9078, 4.5])
+        desired = np.array([0, 72.8, 100])
+
+        actual = battery_voltage_to_percent(voltages)
+        np.testing.assert_equal(actual, desired)
+
     def test_peek_queue(self):
         queue = PeekQueue()
 
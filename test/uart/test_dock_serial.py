@@ -37,9 +37,15 @@ class CRCCalculationTest(TestCase):
         exp_crc = b'\x4b\xc2'
 
         act_crc = generate_crc(msg, crc_init)
-        print(act_crc)
         self.assertEqual(act_crc, exp_crc)
 
+    def test_generate_crc_buffer_unchanged(self):
+        msg = bytearray(b'\x24\x03\x02\x01\x03')
+
+        act_crc = generate_crc(msg, 0xB0CA)
+        self.assertEqual(act_crc, b'\xca\xdc')
+        self.assertEqual(msg, b'\x24\x03\x02\x01\x03')
+
 
 class DockSerialTest(TestCase):
 
@@ -50,9 +56,12 @@ class DockSerialTest(TestCase):
         serial = DockSerial(mock, crc_init=crc_init)
         return serial, mock
 
+    def setUp(self) -> None:
+        self._crc_init = 42
+        self._serial, self._mock = self.create_sot(self._crc_init)
+
     def test_read(self):
-        crc_init = 42
-        serial, mock = self.create_sot(crc_init)
+        crc_init, serial, mock = self._crc_init, self._serial, self._mock
 
         data_no_verify = b'abcd'
         data = b'\x01\x02\x03\x04'
@@ -78,8 +87,7 @@ class DockSerialTest(TestCase):
         self.assertRaises(IOError, serial.end_read_crc_verify)
 
     def test_write(self):
-        crc_init = 42
-        serial, mock = self.create_sot(crc_init)
+        crc_init, serial, mock = self._crc_init, self._serial, self._mock
 
         data_no_verify = b'1234'
         data = b'another test'